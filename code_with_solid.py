@@ -23,72 +23,355 @@ Overall, the refactored code improves maintainability and extensibility by adher
 
 '''
 import logging
+import os
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import LabelEncoder
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import fs
+import pyarrow.parquet as pq
 
 logging.basicConfig(level=logging.INFO)
 
 
+@lru_cache(maxsize=128)
+def _cached_metadata(path: str, mtime_ns: int, size: int) -> pq.FileMetaData:
+    return pq.read_metadata(path)
+
+
+def _read_metadata(path: str) -> pq.FileMetaData:
+    # The Parquet footer is parsed once per version of the file: a rewritten
+    # file has a new modification time or size and misses the cache. URIs
+    # (file://, s3://, ...) are looked up on their own filesystem, and a file
+    # whose filesystem reports no modification time is read uncached.
+    try:
+        filesystem, file_path = fs.FileSystem.from_uri(path)
+    except pa.ArrowInvalid:
+        # Not a URI but a relative local path.
+        path = os.path.abspath(path)
+        filesystem, file_path = fs.LocalFileSystem(), path
+    info = filesystem.get_file_info(file_path)
+    if info.mtime_ns is None:
+        return pq.read_metadata(path)
+    return _cached_metadata(path, info.mtime_ns, info.size)
+
+
 class DataProcessor(ABC):
+    # The column a processor reads and the one it writes, which let the
+    # pipeline read only the needed columns and run independent processors
+    # together. A processor that leaves them as None may read or write any
+    # column: the whole file is then read and it runs on its own.
+    feature_name: str | None = None
+    output_name: str | None = None
+
+    # Processors that need statistics over the whole column (mean, set of
+    # categories, ...) collect them batch by batch in partial_fit before
+    # process_data is called; stateless processors keep these no-op defaults.
+    def reset(self) -> None:
+        pass
+
+    def partial_fit(self, df: pd.DataFrame) -> None:
+        pass
+
+    # process_data reads the feature_name column and returns the name of the
+    # output column (output_name) together with its values, letting the
+    # pipeline insert the column without realigning df. When given, out is a
+    # preallocated buffer of len(df) the values may be written into; a
+    # processor that can't use it (e.g. wrong dtype) returns a new array.
     @abstractmethod
-    def process_data(self, path: str) -> pd.DataFrame:
+    def process_data(self, df: pd.DataFrame, out: np.ndarray | None = None) -> tuple[str, np.ndarray]:
         pass
 
 
 class Standardizer(DataProcessor):
-    def process_data(self, df: pd.DataFrame) -> pd.Series:
+    feature_name = "feature_a"
+    output_name = "feature_a"
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self._fitted = False
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def partial_fit(self, df: pd.DataFrame) -> None:
+        # Merge the batch mean and sum of squared deviations into the
+        # running ones (Chan et al.), which stays accurate over many batches.
+        self._fitted = True
+        feature = df[self.feature_name].to_numpy(dtype=np.float64)
+        feature = feature[~np.isnan(feature)]
+        count = feature.size
+        if count == 0:
+            return
+        mean = feature.mean()
+        deviation = feature - mean
+        m2 = np.dot(deviation, deviation)
+        total = self._count + count
+        delta = mean - self._mean
+        self._mean += delta * count / total
+        self._m2 += m2 + delta ** 2 * self._count * count / total
+        self._count = total
+
+    def process_data(self, df: pd.DataFrame, out: np.ndarray | None = None) -> tuple[str, np.ndarray]:
         # Single Responsibility Principle (SRP):
         # This class has a single responsibility related to standardizing data.
-        std = np.std(df["feature_a"])
-        mean = np.mean(df["feature_a"])
-        standardized_feature = (df["feature_a"] - mean) / std
-        return standardized_feature
+        # Output is float32; the statistics were accumulated in float64.
+        if not self._fitted:
+            raise RuntimeError("Standardizer is not fitted: call partial_fit before process_data")
+        feature = df[self.feature_name].to_numpy()
+        if out is None or out.dtype != np.float32:
+            out = np.empty(len(feature), dtype=np.float32)
+        if self._count == 0:
+            # No value but NaN was seen, whose mean and std are NaN.
+            out.fill(np.nan)
+            return self.output_name, out
+        np.subtract(feature, self._mean, out=out)
+        np.divide(out, np.sqrt(self._m2 / self._count), out=out)
+        return self.output_name, out
 
 
 class Encoder(DataProcessor):
-    def process_data(self, df: pd.DataFrame) -> pd.Series:
+    feature_name = "feature_b"
+    output_name = "feature_b_encoded"
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.categories = None
+        self._value_set = None
+
+    def partial_fit(self, df: pd.DataFrame) -> None:
+        # Codes must agree across batches, so the categories of every batch
+        # are collected, in order of first appearance, before encoding.
+        values = df[self.feature_name].array
+        if isinstance(values, pd.arrays.ArrowExtensionArray):
+            categories = pc.unique(pc.drop_null(pa.array(values))).to_pandas()
+        else:
+            _, categories = pd.factorize(values, sort=False)
+        categories = pd.Index(categories)
+        if self.categories is not None:
+            categories = self.categories.append(categories).unique()
+        self.categories = categories
+        self._value_set = None
+
+    def process_data(self, df: pd.DataFrame, out: np.ndarray | None = None) -> tuple[str, np.ndarray]:
         # Single Responsibility Principle (SRP):
         # This class has a single responsibility related to encoding data.
-        encoder = LabelEncoder()
-        encoded_feature = encoder.fit_transform(df["feature_b"])
-        return pd.Series(encoded_feature, name="feature_b_encoded")
+        if self.categories is None:
+            raise RuntimeError("Encoder is not fitted: call partial_fit before process_data")
+        values = df[self.feature_name].array
+        if isinstance(values, pd.arrays.ArrowExtensionArray):
+            # Arrow-backed column: look the chunks up with Arrow's hashing
+            # kernel instead of converting them for pandas.
+            if self._value_set is None:
+                self._value_set = pa.array(self.categories)
+            codes = pc.index_in(pa.array(values), value_set=self._value_set)
+            encoded_feature = pc.fill_null(codes, -1).to_numpy()
+        else:
+            encoded_feature = self.categories.get_indexer(values)
+        dtype = np.int16 if len(self.categories) <= np.iinfo(np.int16).max else encoded_feature.dtype
+        if out is None or out.dtype != dtype:
+            return self.output_name, encoded_feature.astype(dtype, copy=False)
+        np.copyto(out, encoded_feature, casting="same_kind")
+        return self.output_name, out
 
 
 class NanFiller(DataProcessor):
-    def process_data(self, df: pd.DataFrame) -> pd.Series:
+    feature_name = "feature_c"
+    output_name = "feature_c"
+
+    def process_data(self, df: pd.DataFrame, out: np.ndarray | None = None) -> tuple[str, np.ndarray]:
         # Single Responsibility Principle (SRP):
         # This class has a single responsibility related to filling NaN values.
-        filled_feature = df["feature_c"].fillna(-1)
-        return filled_feature
+        feature = df[self.feature_name]
+        if isinstance(feature.dtype, np.dtype) and feature.dtype.kind == "f":
+            values = feature.to_numpy()
+            if out is None or out.dtype != values.dtype:
+                out = np.empty_like(values)
+            np.copyto(out, values)
+            np.putmask(out, np.isnan(values), -1)
+            return self.output_name, out
+        return self.output_name, feature.fillna(-1).to_numpy()
 
 
 class DataPipeline:
-    def __init__(self, processors: list[DataProcessor]):
+    def __init__(self, processors: list[DataProcessor], batch_size: int = 128 * 1024):
         self.processors = processors
+        self.batch_size = batch_size
+        # Only the columns the processors work on are read from disk,
+        # leaving out those produced by an earlier processor; columns no
+        # processor reads are not in the output either.
+        self.columns = []
+        produced = set()
+        for processor in processors:
+            if processor.feature_name is None or processor.output_name is None:
+                self.columns = None
+                break
+            if processor.feature_name not in produced and processor.feature_name not in self.columns:
+                self.columns.append(processor.feature_name)
+            produced.add(processor.output_name)
+        self.groups = self._group_processors(processors)
+        # Bound once here instead of being looked up for every batch.
+        self._group_fns = [
+            [processor.process_data for processor in group] for group in self.groups
+        ]
+        # Output buffers, one per processor, reused from batch to batch and
+        # across calls: df[name] = values copies the values into the frame,
+        # so a buffer is free again as soon as it has been assigned.
+        self._buffers = {}
 
-    def process(self, path: str) -> pd.DataFrame:
-        df = pd.read_parquet(path)
-        logging.info(f"Data: {df}")
-        for processor in self.processors:
-            # Dependency Inversion Principle (DIP):
-            # DataPipeline depends on abstractions (DataProcessor),
-            # not on concrete implementations. This allows DataPipeline
-            # to work with any class that implements DataProcessor.
-            df = pd.concat([df, processor.process_data(df)], axis=1)
+    @staticmethod
+    def _group_processors(processors: list[DataProcessor]) -> list[list[DataProcessor]]:
+        # Consecutive processors that don't read a column written by another
+        # processor of their group are independent and run concurrently; one
+        # that doesn't declare its columns gets a group to itself.
+        groups = []
+        written = set()
+        undeclared = False
+        for processor in processors:
+            declared = processor.feature_name is not None and processor.output_name is not None
+            if not groups or undeclared or not declared or processor.feature_name in written:
+                groups.append([])
+                written = set()
+            groups[-1].append(processor)
+            written.add(processor.output_name)
+            undeclared = not declared
+        return groups
+
+    def _iter_batches(self, parquet_file: pq.ParquetFile):
+        # The next batch is read and decoded on a background thread while
+        # the current one is processed, overlapping I/O with compute.
+        batches = parquet_file.iter_batches(
+            batch_size=self.batch_size, columns=self.columns, use_threads=True
+        )
+
+        def read_next():
+            batch = next(batches, None)
+            return None if batch is None else batch.to_pandas(self_destruct=True, split_blocks=True)
+
+        with ThreadPoolExecutor(max_workers=1) as reader:
+            future = reader.submit(read_next)
+            if (df := future.result()) is None:
+                # A file without rows still yields one empty batch, so the
+                # processors are fitted and the output has their columns.
+                schema = parquet_file.schema_arrow
+                if self.columns is not None:
+                    schema = pa.schema([schema.field(name) for name in self.columns])
+                yield schema.empty_table().to_pandas()
+                return
+            while df is not None:
+                future = reader.submit(read_next)
+                yield df
+                df = future.result()
+
+    def _apply(self, executor: ThreadPoolExecutor, fns: list, df: pd.DataFrame) -> pd.DataFrame:
+        n = len(df)
+
+        def run(fn):
+            buffer = self._buffers.get(fn)
+            out = buffer[:n] if buffer is not None and len(buffer) >= n else None
+            return fn, fn(df, out=out)
+
+        if len(fns) == 1:
+            results = [run(fns[0])]
+        else:
+            # Every processor of the group reads df, so nothing is assigned
+            # until all of them have returned.
+            results = list(executor.map(run, fns))
+        for fn, (name, values) in results:
+            df[name] = values
+            # An array the processor allocated itself becomes its buffer
+            # for the next batch.
+            if values.flags.owndata and values.flags.writeable:
+                self._buffers[fn] = values
         return df
 
+    def _process_batches(self, path: str):
+        # The file is streamed batch by batch so that only one batch of
+        # input is decoded at a time. Each group of processors is fitted on
+        # the output of the groups before it, one pass per group, and a
+        # last pass applies them all. Groups whose processors all keep the
+        # no-op partial_fit need no fitting and get no pass of their own.
+        parquet_file = pq.ParquetFile(
+            path, metadata=_read_metadata(path), pre_buffer=True, buffer_size=256 * 1024
+        )
+        max_workers = max(map(len, self.groups), default=1)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for i, group in enumerate(self.groups):
+                for processor in group:
+                    processor.reset()
+                if all(type(processor).partial_fit is DataProcessor.partial_fit for processor in group):
+                    continue
+                for df in self._iter_batches(parquet_file):
+                    for fitted_fns in self._group_fns[:i]:
+                        df = self._apply(executor, fitted_fns, df)
+                    list(executor.map(lambda processor: processor.partial_fit(df), group))
+
+            for df in self._iter_batches(parquet_file):
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.debug("Data shape=%s dtypes=%s", df.shape, df.dtypes.to_dict())
+                for fns in self._group_fns:
+                    # Dependency Inversion Principle (DIP):
+                    # DataPipeline depends on abstractions (DataProcessor),
+                    # not on concrete implementations. This allows DataPipeline
+                    # to work with any class that implements DataProcessor.
+                    df = self._apply(executor, fns, df)
+                yield df
+
+    def process(self, path: str) -> pd.DataFrame:
+        return pd.concat(list(self._process_batches(path)), ignore_index=True)
+
+    def process_to_parquet(self, path: str, output_path: str) -> None:
+        # Each processed batch is written out as soon as it is ready, on a
+        # background thread, so the output is never held in memory as a
+        # whole; at most one write is in flight at a time.
+        writer = None
+        try:
+            with ThreadPoolExecutor(max_workers=1) as write_executor:
+                pending = None
+                for df in self._process_batches(path):
+                    if writer is None:
+                        table = pa.Table.from_pandas(df, preserve_index=False)
+                        writer = pq.ParquetWriter(
+                            output_path,
+                            table.schema,
+                            compression="zstd",
+                            compression_level=3,
+                            use_dictionary=True,
+                            data_page_size=1024 * 1024,
+                        )
+                    else:
+                        table = pa.Table.from_pandas(df, schema=writer.schema, preserve_index=False)
+                    if table.num_rows == 0:
+                        # The empty batch of a file without rows only gives
+                        # the writer its schema; no empty row group is written.
+                        continue
+                    if pending is not None:
+                        pending.result()
+                    pending = write_executor.submit(
+                        writer.write_table, table, row_group_size=128 * 1024
+                    )
+                if pending is not None:
+                    pending.result()
+        finally:
+            if writer is not None:
+                writer.close()
+
 
 def main():
     processors = [Standardizer(), Encoder(), NanFiller()]
     pipeline = DataPipeline(processors)
     path = "data/data.parquet"
     output_path = "data/preprocessed_data.parquet"
-    processed_df = pipeline.process(path)
-    logging.info(f"Processed data: {processed_df}")
-    processed_df.to_parquet(output_path)
+    pipeline.process_to_parquet(path, output_path)
+    logging.info(f"Processed data saved to {output_path}")
 
 
 if __name__ == "__main__":
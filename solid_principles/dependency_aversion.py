@@ -37,7 +37,9 @@ This design allows you to easily substitute different implementations of the int
 import logging
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import LabelEncoder
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from abc import ABC, abstractmethod
 
 logging.basicConfig(level=logging.INFO)
@@ -54,18 +56,34 @@ class IDataSaver(ABC):
         pass
 
 class IDataProcessingStep(ABC):
+    # The column a step reads and the columns it adds, used to read only the
+    # columns the steps need. A step that leaves feature_name as None may
+    # read any column, and the whole file is then read.
+    feature_name: str | None = None
+    added_columns: tuple[str, ...] = ()
+
     @abstractmethod
     def apply(self, df: pd.DataFrame) -> pd.DataFrame:
         pass
 
 # Concrete implementations
 class DataLoader(IDataLoader):
-    def __init__(self, path: str):
+    def __init__(self, path: str, columns: list[str] | None = None):
         self.path = path
+        self.columns = columns
 
     def load_data(self) -> pd.DataFrame:
-        df = pd.read_parquet(self.path)
-        logging.info(f"Data loaded from {self.path}: {df.head()}")
+        table = pq.read_table(
+            self.path,
+            columns=self.columns,
+            use_threads=True,
+            pre_buffer=True,
+            buffer_size=256 * 1024,
+        )
+        df = table.to_pandas(self_destruct=True, split_blocks=True)
+        logging.info("Data loaded from %s", self.path)
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Data shape=%s dtypes=%s", df.shape, df.dtypes.to_dict())
         return df
 
 class DataSaver(IDataSaver):
@@ -73,7 +91,15 @@ class DataSaver(IDataSaver):
         self.output_path = output_path
 
     def save_data(self, df: pd.DataFrame):
-        df.to_parquet(self.output_path)
+        df.to_parquet(
+            self.output_path,
+            engine="pyarrow",
+            compression="zstd",
+            compression_level=3,
+            row_group_size=128 * 1024,
+            use_dictionary=True,
+            data_page_size=1024 * 1024,
+        )
         logging.info(f"Data saved to {self.output_path}")
 
 class NormalizeFeature(IDataProcessingStep):
@@ -81,9 +107,14 @@ class NormalizeFeature(IDataProcessingStep):
         self.feature_name = feature_name
 
     def apply(self, df: pd.DataFrame) -> pd.DataFrame:
-        std = np.std(df[self.feature_name])
-        mean = np.mean(df[self.feature_name])
-        df[self.feature_name] = (df[self.feature_name] - mean) / std
+        # Mean and std are taken in float64 from the full-precision column
+        # (NaNs skipped as np.std does); only the centered and scaled result
+        # is written, in place, to a float32 buffer.
+        source = df[self.feature_name].to_numpy(dtype=np.float64)
+        feature = np.empty(len(source), dtype=np.float32)
+        np.subtract(source, np.nanmean(source), out=feature)
+        np.divide(feature, np.nanstd(source), out=feature)
+        df[self.feature_name] = feature
         logging.info(f"Feature '{self.feature_name}' normalized")
         return df
 
@@ -91,10 +122,25 @@ class EncodeCategoricalFeature(IDataProcessingStep):
     def __init__(self, feature_name: str, encoded_feature_name: str):
         self.feature_name = feature_name
         self.encoded_feature_name = encoded_feature_name
-        self.encoder = LabelEncoder()
+        self.added_columns = (encoded_feature_name,)
 
     def apply(self, df: pd.DataFrame) -> pd.DataFrame:
-        df[self.encoded_feature_name] = self.encoder.fit_transform(df[self.feature_name])
+        values = df[self.feature_name].array
+        if isinstance(values, pd.arrays.ArrowExtensionArray):
+            # Arrow-backed column: encode its chunks with Arrow's hashing
+            # kernel instead of going through pandas' hash tables.
+            encoded = pc.dictionary_encode(pa.array(values))
+            if isinstance(encoded, pa.ChunkedArray):
+                encoded = encoded.combine_chunks()
+            codes = pc.fill_null(encoded.indices, -1).to_numpy()
+            categories = encoded.dictionary.to_pandas()
+        else:
+            codes, categories = pd.factorize(values, sort=False)
+        # Codes use the narrowest integer type for the cardinality.
+        for dtype in (np.int8, np.int16, np.int32, np.int64):
+            if len(categories) <= np.iinfo(dtype).max:
+                break
+        df[self.encoded_feature_name] = codes.astype(dtype, copy=False)
         logging.info(f"Feature '{self.feature_name}' encoded to '{self.encoded_feature_name}'")
         return df
 
@@ -104,10 +150,30 @@ class FillNaNFeature(IDataProcessingStep):
         self.fill_value = fill_value
 
     def apply(self, df: pd.DataFrame) -> pd.DataFrame:
-        df[self.feature_name] = df[self.feature_name].fillna(self.fill_value)
+        feature = df[self.feature_name]
+        if isinstance(feature.dtype, np.dtype) and feature.dtype.kind == "f":
+            # Dense numpy float column: fill a copy of the raw array in place.
+            values = feature.to_numpy(copy=True)
+            np.putmask(values, np.isnan(values), self.fill_value)
+            df[self.feature_name] = values
+        else:
+            df[self.feature_name] = feature.fillna(self.fill_value)
         logging.info(f"NaN values in feature '{self.feature_name}' filled with '{self.fill_value}'")
         return df
 
+def _input_columns(steps) -> list[str] | None:
+    # Only the columns the steps read are loaded, leaving out those added by
+    # an earlier step; columns no step reads are not in the output either.
+    columns = []
+    added = set()
+    for step in steps:
+        if step.feature_name is None:
+            return None
+        if step.feature_name not in added and step.feature_name not in columns:
+            columns.append(step.feature_name)
+        added.update(step.added_columns)
+    return columns
+
 def process_data(loader: IDataLoader, saver: IDataSaver, steps: list[IDataProcessingStep]):
     # Load data
     df = loader.load_data()
@@ -123,13 +189,14 @@ def main():
     path = "data/data.parquet"
     output_path = "data/preprocessed_data.parquet"
     
-    loader = DataLoader(path)
-    saver = DataSaver(output_path)
     steps = [
         NormalizeFeature("feature_a"),
         EncodeCategoricalFeature("feature_b", "feature_b_encoded"),
         FillNaNFeature("feature_c", -1)
     ]
+    columns = _input_columns(steps)
+    loader = DataLoader(path, columns=columns)
+    saver = DataSaver(output_path)
     
     process_data(loader, saver, steps)
 
@@ -4,14 +4,14 @@
 """
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import LabelEncoder
-from typing import List
+import pyarrow.parquet as pq
+from typing import List, Optional
 
 
 # Good code
 def process(path: str, output_path: str) -> None:
     """"""
-    df = load_data(path)
+    df = load_data(path, columns=["feature_a", "feature_b", "feature_c"])
     normalized_feature = normalize_feature(df["feature_a"])
     encoded_feature = encode_feature(df["feature_b"])
     filled_feature = fill_feature(df["feature_c"])
@@ -24,28 +24,41 @@ def process(path: str, output_path: str) -> None:
     save_df(df=processed_df, path=output_path)
 
 
-def load_data(path: str) -> pd.DataFrame:
+def load_data(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
     """"""
-    return pd.read_parquet(path)
+    table = pq.read_table(
+        path,
+        columns=columns,
+        use_threads=True,
+        pre_buffer=True,
+        buffer_size=256 * 1024,
+    )
+    return table.to_pandas(self_destruct=True, split_blocks=True)
     
 
 def normalize_feature(feature: pd.Series) -> pd.Series:
     """"""
-    std = np.std(feature)
-    mean = np.mean(feature)
-    return (feature - mean) / std
+    source = feature.to_numpy(dtype=np.float64)
+    array = np.empty(len(source), dtype=np.float32)
+    np.subtract(source, np.nanmean(source), out=array)
+    np.divide(array, np.nanstd(source), out=array)
+    return pd.Series(array, index=feature.index, name=feature.name)
 
 
 def encode_feature(feature: pd.Series) -> pd.Series:
     """"""
-    encoder = LabelEncoder()
-    array = encoder.fit_transform(feature)
-    return pd.Series(array, name=feature.name)
+    array, uniques = pd.factorize(feature.array, sort=False)
+    array = array.astype(np.int16 if len(uniques) <= np.iinfo(np.int16).max else np.int32)
+    return pd.Series(array, index=feature.index, name=feature.name)
 
 
 def fill_feature(feature: pd.Series, value: int = -1) -> pd.Series:
     """"""
-    return feature.fillna(value=value)
+    if not (isinstance(feature.dtype, np.dtype) and feature.dtype.kind == "f"):
+        return feature.fillna(value=value)
+    array = feature.to_numpy(copy=True)
+    np.putmask(array, np.isnan(array), value)
+    return pd.Series(array, index=feature.index, name=feature.name)
 
 
 def compose_df(*args, column_names: List[str]) -> pd.DataFrame:
@@ -56,7 +69,15 @@ def compose_df(*args, column_names: List[str]) -> pd.DataFrame:
 
 def save_df(df: pd.DataFrame, path: str) -> None:
     """"""
-    df.to_parquet(path)
+    df.to_parquet(
+        path,
+        engine="pyarrow",
+        compression="zstd",
+        compression_level=3,
+        row_group_size=128 * 1024,
+        use_dictionary=True,
+        data_page_size=1024 * 1024,
+    )
 
 
 def main():